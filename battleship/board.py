@@ -1,10 +1,14 @@
-from battleship.ship import Ship, ShipFactory
+from battleship.ship import Ship, ShipFactory, _cells_mask
 from battleship.convert import CellConverter
 
 class Board:
     """ Class representing the board of the player. 
             
     Acts as an interface between the player and its ships.
+    
+    The board owns its ships: once the board is created, they must only be
+    damaged through is_attacked_at(), and self.ships must not be replaced.
+    have_all_ships_sunk() relies on the hits recorded by is_attacked_at().
     """
     def __init__(self, ships=None, size=(10,10), 
                 ships_per_length={1: 1, 2: 1, 3: 1, 4: 1, 5: 1}):
@@ -42,6 +46,18 @@ class Board:
             self.ships = ships
             
         self.validate_ships()
+        
+        # Bitmasks of the cells occupied by a ship, and of those that have been hit (only through is_attacked_at).
+        # They use the bit layout of Ship._cell_bit, for a width that fits all the ships.
+        self.mask_width = max([self.width] + [ship.x_end for ship in self.ships])
+        self.ship_mask = 0
+        for ship in self.ships:
+            if ship.board_width == self.mask_width:
+                self.ship_mask |= ship.cells_mask
+            else:
+                self.ship_mask |= _cells_mask((ship.x_start, ship.y_start),
+                                              (ship.x_end, ship.y_end), self.mask_width)
+        self.hit_mask = 0
     
     def validate_ships(self):
         """ Validate the ship arrangements on the board.
@@ -102,23 +118,14 @@ class Board:
     def have_all_ships_sunk(self):
         """ Check whether all ships have sunk.
         
+        Only attacks made through is_attacked_at() are taken into account.
+        
         Returns:
             bool : return True if all ships on the board have sunk.
                return False otherwise.
         """
-        #Create a list of sunk ships
-        sunk_ships_list = []
-        #iterate through the list of ship instances
-        for ship in self.ships:
-            #Check if each ship in the ships list has sunk and if so, append the ship to the sunk_ships_list
-            if ship.has_sunk():
-                sunk_ships_list.append(ship)
-        #When the length of the sunk_ships_list equals that of the ships_list, all ships have sunk. Function returns True
-        if len(sunk_ships_list) == len(self.ships):
-            return True
-        #If the lengths of the lists are not equivalent, return False. Not all ships have sunk    
-        else:
-            return False
+        #Only cells occupied by a ship are recorded in hit_mask, so all ships have sunk once every one of them is hit
+        return self.hit_mask == self.ship_mask
     
     def is_attacked_at(self, cell):
         """ Board is attacked at an (x, y) cell coordinate.
@@ -137,6 +144,14 @@ class Board:
         """
         # Mark the cell that has been attacked for visualisation purposes
         self.marked_cells.add(cell)
+        #If no ship occupies the cell, the attack has missed and the ships do not need to be checked
+        x, y = cell
+        if not (0 < x <= self.mask_width and y > 0):
+            return (False, False)
+        cell_bit = _cells_mask(cell, cell, self.mask_width)
+        if not self.ship_mask & cell_bit:
+            return (False, False)
+        self.hit_mask |= cell_bit
         #Iterate through the ships list
         for ship in self.ships:
             #Check if the cell ckecked against is present in the cells occupied by the current ship instance in the iterable
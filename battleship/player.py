@@ -1,20 +1,103 @@
+import itertools
+import os
 import random
+from collections import deque
 
 from battleship.board import Board
 from battleship.convert import CellConverter
+from battleship.ship import _cells_mask
+
+# Random generator used by the players to pick their targets
+_RNG = random.Random()
+_randrange = _RNG.randrange
+
+# Reseed it in forked processes (as the random module does), so that workers do not draw the same targets
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_RNG.seed)
+
+def seed(a=None):
+    """ Seed the random generator used by the players to pick their targets.
+
+    Args:
+        a (int): seed of the random generator. Defaults to None (seeded from
+            the current time or an operating system source)
+    """
+    _RNG.seed(a)
+
+class _CellPool:
+    """ Pool of (x, y) cells from which random cells can be drawn.
+
+    Drawing and discarding cells both take constant time: the removed cell is
+    swapped with the last one before popping (the order of the cells is not
+    preserved), and the index of every cell is kept in a dict.
+    """
+    __slots__ = ('cells', 'indices')
+
+    def __init__(self, cells):
+        """ Initialises the pool with the given cells.
+
+        Args:
+            cells (iterable[tuple[int, int]]): (x, y) cell coordinates
+        """
+        self.cells = list(cells)
+        self.indices = {cell: index for index, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.indices
+
+    def pop_random(self):
+        """ Remove and return a random cell from the pool.
+
+        Returns:
+            tuple[int, int] : the removed (x, y) cell coordinates
+
+        Raises:
+            IndexError: if the pool is empty
+        """
+        if not self.cells:
+            raise IndexError("No cells left to draw from.")
+        return self._remove_at(_randrange(len(self.cells)))
+
+    def discard(self, cell):
+        """ Remove a cell from the pool if it is present.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+        """
+        index = self.indices.get(cell)
+        if index is not None:
+            self._remove_at(index)
+
+    def _remove_at(self, index):
+        """ Swap the cell at index with the last cell, then pop it."""
+        cell = self.cells[index]
+        last_cell = self.cells[-1]
+        self.cells[index] = last_cell
+        self.indices[last_cell] = index
+        self.cells.pop()
+        del self.indices[cell]
+        return cell
 
 class Player:
     """ Class representing the player
     """
-    count = 0  # for keeping track of number of players
+    default_counter = itertools.count(1)  # numbers players that are not given a name nor a counter
+    __slots__ = ('board', 'name')
     
-    def __init__(self, board=None, name=None):
+    def __init__(self, board=None, name=None, counter=None):
         """ Initialises a new player with its board.
 
         Args:
             board (Board): The player's board. If not provided, then a board
                 will be generated automatically
-            name (str): Player's name
+            name (str): Player's name. If not provided, then the player is
+                named after the next number of counter
+            counter (iterator[int]): Numbers used to name players without a
+                name, e.g. an itertools.count() shared by the players of a
+                game. Defaults to Player.default_counter
         """
         
         if board is None:
@@ -22,9 +105,10 @@ class Player:
         else:
             self.board = board
         
-        Player.count += 1
         if name is None:
-            self.name = f"Player {self.count}"
+            if counter is None:
+                counter = Player.default_counter
+            self.name = f"Player {next(counter)}"
         else:
             self.name = name
     
@@ -68,16 +152,24 @@ class Player:
 class ManualPlayer(Player):
     """ A player playing manually via the terminal
     """
-    def __init__(self, board, name=None):
+    __slots__ = ('converter', '_str_to_xy')
+
+    def __init__(self, board, name=None, counter=None):
         """ Initialise the player with a board and other attributes.
         
         Args:
             board (Board): The player's board. If not provided, then a board
                 will be generated automatically
             name (str): Player's name
+            counter (iterator[int]): Numbers used to name the player if no
+                name is given (see Player)
         """
-        super().__init__(board=board, name=name)
+        super().__init__(board=board, name=name, counter=counter)
         self.converter = CellConverter((board.width, board.height))
+        # String representation (e.g. "B1") of every cell on the board, mapped to its (x, y) coordinates
+        self._str_to_xy = {self.converter.to_str((x, y)): (x, y)
+                           for x in range(1, board.width + 1)
+                           for y in range(1, board.height + 1)}
         
     def select_target(self):
         """ Read coordinates from user prompt.
@@ -91,27 +183,52 @@ class ManualPlayer(Player):
         while True:
             try:
                 coord_str = input('coordinates target = ')
-                x, y = self.converter.from_str(coord_str)
-                return x, y
+                return self.cell_from_str(coord_str)
             except ValueError as error:
                 print(error)
 
 
+    def cell_from_str(self, coord_str):
+        """ Convert a cell position in string format (e.g. B1) to (x, y) coordinates.
+        
+        Args:
+            coord_str (str): String representation of cell (e.g. "C3")
+        
+        Returns:
+            tuple[int, int] : (x, y) cell coordinates
+        
+        Raises:
+            ValueError: if the string is not a cell of the board
+        """
+        try:
+            return self._str_to_xy[coord_str.strip()]
+        except KeyError:
+            #Less common forms (e.g. "A01") are parsed, and invalid positions reported, by the converter
+            return self.converter.from_str(coord_str)
+
+
 class RandomPlayer(Player):
     """ A Player that plays at random positions.
 
     However, it does not play at the positions:
     - that it has previously attacked
     """
-    def __init__(self, name=None):
+    __slots__ = ('tracker', 'remaining_cells')
+
+    def __init__(self, name=None, counter=None):
         """ Initialise the player with an automatic board and other attributes.
         
         Args:
             name (str): Player's name
+            counter (iterator[int]): Numbers used to name the player if no
+                name is given (see Player)
         """
         # Initialise with a board with ships automatically arranged.
-        super().__init__(board=Board(), name=name)
+        super().__init__(board=Board(), name=name, counter=counter)
         self.tracker = set()
+        # Cells that have not been attacked yet
+        self.remaining_cells = _CellPool((x, y) for x in range(1, self.board.width + 1)
+                                         for y in range(1, self.board.height + 1))
 
     def select_target(self):
         """ Generate a random cell that has previously not been attacked.
@@ -122,60 +239,71 @@ class RandomPlayer(Player):
             tuple[int, int] : (x, y) cell coordinates at which to launch the 
                 next attack
         """
-        target_cell = self.generate_random_target()
+        target_cell = self.remaining_cells.pop_random()
         self.tracker.add(target_cell)
         return target_cell
 
-    def generate_random_target(self):
-        """ Generate a random cell that has previously not been attacked.
-               
-        Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
-        """
-        has_been_attacked = True
-        random_cell = None
-        
-        while has_been_attacked:
-            random_cell = self.get_random_coordinates()
-            has_been_attacked = random_cell in self.tracker
-
-        return random_cell
-
-    def get_random_coordinates(self):
-        """ Generate random coordinates.
-               
-        Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
-        """
-        x = random.randint(1, self.board.width)
-        y = random.randint(1, self.board.height)
-        return (x, y)
-
 
 class AutomaticPlayer(Player):
     """ Player playing automatically using a strategy."""
-    def __init__(self, name=None):
+    __slots__ = ('implement_strategy', 'attacked_positions', 'previous_coordinates',
+                 'target_hits', 'target_queue', 'remaining_ship_lengths', 'placements',
+                 'blocked_mask')
+
+    def __init__(self, name=None, counter=None):
         """ Initialise the player with an automatic board and other attributes.
         
         Args:
             name (str): Player's name
+            counter (iterator[int]): Numbers used to name the player if no
+                name is given (see Player)
         """
         # Initialise with a board with ships automatically arranged.
-        super().__init__(board=Board(), name=name)
+        super().__init__(board=Board(), name=name, counter=counter)
         #Define attributes of AutomaticPlayer subclass
         #Boolean. If True it executes the strategy_function method of the AutomaticPlayer
         self.implement_strategy = False
-        #A list to record all the positions of the cells which the AutomaticPlayer attacked
-        self.attacked_positions = []
+        #A set to record all the positions of the cells which the AutomaticPlayer attacked
+        self.attacked_positions = set()
         #Define the previous_coordinates of the cell the AutomaticPlayer attacked
         self.previous_coordinates = None
-        #Self cycle is constrained between 1-4 and is used in the strategy_function method of the AutomaticPlayer
-        self.cycle = 0
-        #Save the initial_coordinates, the AutomaticPlayer attacked
-        self.save_ship_initial = None
+        #Cells of the ship currently being attacked that have been hit so far
+        self.target_hits = []
+        #Queue of candidate cells to attack next while the strategy_function is implemented
+        self.target_queue = deque()
+        #Lengths of the opponent's ships that have not sunk yet, assuming the opponent uses the same configuration
+        self.remaining_ship_lengths = [length for length, count in self.board.ships_per_length.items()
+                                       for _ in range(count)]
+        #Every placement (bitmask, cells) on the board of a ship of each length, used to build the density of the ships
+        self.placements = {length: self.get_placements(length) for length in set(self.remaining_ship_lengths)}
+        #Bitmask (see Ship._cell_bit) of the cells that cannot hold a floating ship: cells attacked and cells near sunk ships
+        self.blocked_mask = 0
+
+    def get_placements(self, length):
+        """ Get every placement of a ship of the given length on the board.
 
+        Args:
+            length (int): length of the ship
+
+        Returns:
+            list[tuple] : (cells_mask, cells) of every placement, where
+                cells_mask is the bitmask of the cells of the placement (see
+                Ship._cell_bit) and cells is the tuple of its (x, y) cells
+        """
+        width, height = self.board.width, self.board.height
+        placements = []
+        for x in range(1, width + 1):
+            for y in range(1, height + 1):
+                #Horizontal placement, then vertical placement (which is the same one for a ship of length 1)
+                ends = [(x + length - 1, y)]
+                if length > 1:
+                    ends.append((x, y + length - 1))
+                for end in ends:
+                    if end[0] <= width and end[1] <= height:
+                        cells = tuple((cell_x, cell_y) for cell_x in range(x, end[0] + 1)
+                                      for cell_y in range(y, end[1] + 1))
+                        placements.append((_cells_mask((x, y), end, width), cells))
+        return placements
         
     def select_target(self):
         """ Select target coordinates to attack.
@@ -187,17 +315,60 @@ class AutomaticPlayer(Player):
         #When the attribute is True, the coordinates are updated via the strategy_function
         if self.implement_strategy:
             coordinates = self.strategy_function()
-        #When the attribute is not True, the coordinates for the next attack are randomly generated
+        #When the attribute is not True, the coordinates for the next attack are where the remaining ships are the most likely to be
         else:
-            coordinates = self.get_random_coordinates()
-            #If the generated coordinates are in the saved list of already attacked positions, new random coordinates are generated
-            while coordinates in self.attacked_positions:
-                coordinates = self.get_random_coordinates()
-        #Overall the new_coordinates are stored in the self.previous_coordinates attribute and appended in the self.attacked_positions list
+            coordinates = self.draw_hunt_target()
+        #Overall the new_coordinates are stored in the self.previous_coordinates attribute and added to the self.attacked_positions set
+        #They are also blocked for the density of the ships
         self.previous_coordinates = coordinates
-        self.attacked_positions.append(coordinates)
+        self.attacked_positions.add(coordinates)
+        self.blocked_mask |= _cells_mask(coordinates, coordinates, self.board.width)
         return coordinates
 
+    def draw_hunt_target(self):
+        """ Select the cell most likely to hold a ship while hunting for a ship.
+
+        For every remaining ship, count the placements that avoid the blocked
+        cells and cover each cell. The cell covered by the most placements is
+        selected, with ties broken at random. If no placement is left, for
+        example because the opponent's ships differ from the player's own
+        configuration, a random cell is drawn instead.
+
+        Returns:
+            tuple[int, int] : (x, y) cell coordinates at which to launch the 
+                next attack
+        """
+        density = {}
+        for length in set(self.remaining_ship_lengths):
+            weight = self.remaining_ship_lengths.count(length)
+            for cells_mask, cells in self.placements[length]:
+                if not cells_mask & self.blocked_mask:
+                    for cell in cells:
+                        density[cell] = density.get(cell, 0) + weight
+        if not density:
+            return self.draw_random_target()
+        highest_density = max(density.values())
+        best_cells = [cell for cell, cell_density in density.items() if cell_density == highest_density]
+        return best_cells[_randrange(len(best_cells))]
+
+    def draw_random_target(self):
+        """ Draw a random cell that has not been attacked yet while hunting for a ship.
+
+        Cells that are not blocked (i.e. not next to a sunk ship) are drawn
+        first. Only used when no placement of the remaining ships is left.
+
+        Returns:
+            tuple[int, int] : (x, y) cell coordinates at which to launch the 
+                next attack
+        """
+        cells = [(x, y) for x in range(1, self.board.width + 1) for y in range(1, self.board.height + 1)
+                 if (x, y) not in self.attacked_positions]
+        open_cells = [cell for cell in cells
+                      if not _cells_mask(cell, cell, self.board.width) & self.blocked_mask]
+        if open_cells:
+            cells = open_cells
+        return cells[_randrange(len(cells))]
+
     def receive_result(self, is_ship_hit, has_ship_sunk):
         """ Receive the result of the attack.
 
@@ -205,33 +376,68 @@ class AutomaticPlayer(Player):
             is_ship_hit (bool): True if ship was attacked, False if not
             has_ship_sunk (bool): True if ship has sunk, otherwise False
         """
-        #If a ship has been hit and did not sink, implement the strategy_function
-        if is_ship_hit and not has_ship_sunk:
-            self.implement_strategy = True
-            #In the case the self.save_ship_initial attribute is None, then update it using the self.previous_coordinates attribute
-            if self.save_ship_initial == None:
-                self.save_ship_initial = (self.previous_coordinates[0], self.previous_coordinates[1])
-        #If the ship has sunk, do not implement the strategy_function, initiate self.cycle again and set self.save_ship_initial to None
-        elif has_ship_sunk:
+        #Record the hit, so that the next targets can be worked out from all the hits on the ship
+        if is_ship_hit:
+            self.target_hits.append(self.previous_coordinates)
+        #If the ship has sunk, do not implement the strategy_function and forget about the ship
+        if has_ship_sunk:
+            #The number of hits on the ship gives its length. Keep track of the lengths of the ships that are still floating
+            if len(self.target_hits) in self.remaining_ship_lengths:
+                self.remaining_ship_lengths.remove(len(self.target_hits))
+            #No other ship can be in the rectangle of cells around the sunk ship
+            x_coordinates = [x for x, _ in self.target_hits]
+            y_coordinates = [y for _, y in self.target_hits]
+            self.blocked_mask |= _cells_mask((min(x_coordinates) - 1, min(y_coordinates) - 1),
+                                             (max(x_coordinates) + 1, max(y_coordinates) + 1),
+                                             self.board.width)
             self.implement_strategy = False
-            self.cycle = 0
-            self.save_ship_initial = None
-        #In the case the strategy_function was executed but the ship was not hit, update self_cycle and  the self.previous_coordinates attribute
-        #This ensures that once a ship was not hit following implementation of the strategy_function, the next attack will hit the ship 
-        elif not is_ship_hit and self.implement_strategy and self.cycle < 4:
-            self.cycle += 1
-            self.previous_coordinates = (self.save_ship_initial[0], self.save_ship_initial[1])   
-
-    def get_random_coordinates(self):
-        """ Generate random coordinates.
-               
+            self.target_hits.clear()
+            self.target_queue.clear()
+        #If a ship has been hit and did not sink, queue the cells where the rest of the ship can be and implement the strategy_function
+        elif is_ship_hit:
+            self.implement_strategy = True
+            self.queue_targets()
+
+    def queue_targets(self):
+        """ Queue the cells where the rest of the ship being attacked can be.
+
+        After the first hit, these are the 4 neighbours of the hit cell. Once
+        the ship has been hit twice, its axis is known and only the two cells
+        extending the line of hits are queued: ships are never next to each
+        other, so no other neighbour can be part of a ship.
+        """
+        if len(self.target_hits) == 1:
+            x, y = self.target_hits[0]
+            candidates = [(x, y+1), (x+1, y), (x, y-1), (x-1, y)]
+        else:
+            x_coordinates = [x for x, _ in self.target_hits]
+            y_coordinates = [y for _, y in self.target_hits]
+            #The ship is vertical if all hits are in the same column, horizontal otherwise
+            if min(x_coordinates) == max(x_coordinates):
+                x = x_coordinates[0]
+                candidates = [(x, max(y_coordinates)+1), (x, min(y_coordinates)-1)]
+            else:
+                y = y_coordinates[0]
+                candidates = [(max(x_coordinates)+1, y), (min(x_coordinates)-1, y)]
+            #Neighbours queued off the axis of the ship cannot be part of it
+            self.target_queue.clear()
+        #Only queue cells within the boundaries of the board that have not been attacked
+        for coordinates in candidates:
+            if self.is_valid_target(coordinates):
+                self.target_queue.append(coordinates)
+
+    def is_valid_target(self, coordinates):
+        """ Check whether a cell is on the board and has not been attacked yet.
+
+        Args:
+            coordinates (tuple[int, int]): (x, y) cell coordinates
+
         Returns:
-            tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
+            bool : True if the cell can be attacked, False otherwise
         """
-        x = random.randint(1, self.board.width)
-        y = random.randint(1, self.board.height)
-        return (x, y)
+        x, y = coordinates
+        return (0 < x <= self.board.width and 0 < y <= self.board.height
+                and coordinates not in self.attacked_positions)
 
     def strategy_function(self):
         """ Implement a strategy once a ship is attacked.
@@ -239,38 +445,12 @@ class AutomaticPlayer(Player):
         Return:
             coordinates (tuple(int, int)): Return updated coordinates on which to launch the next attack
         """
-        x, y = self.previous_coordinates
-        #If self.cycle attribute is zero, move vertically up the board by 1 cell
-        if self.cycle == 0:
-            coordinates = (x, y+1)
-            #This ensures the move happens within the bounds of the board
-            if 0 < coordinates[0] <= self.board.width and 0 < coordinates[1] <= self.board.height:
+        #Pop queued cells until one that can still be attacked is found
+        while self.target_queue:
+            coordinates = self.target_queue.popleft()
+            if self.is_valid_target(coordinates):
                 return coordinates
-            #If it does not then perform another move ie, move horizontally by 1 cell
-            else:
-                self.cycle += 1
-        #If self.cycle attribute is one, move horizontally east of the board by 1 cell
-        if self.cycle == 1:
-            coordinates = (x+1, y)
-            #Check if new_coordinates are within the boundaries of the board
-            if 0 < coordinates[0] <= self.board.width and 0 < coordinates[1] <= self.board.height:
-                return coordinates
-            else:
-                self.cycle += 1
-        #If self.cycle attribute is two, move vertically down the board by 1 cell
-        if self.cycle == 2:
-            coordinates = (x, y-1)
-            #Check if new_coordinates are within the boundaries of the board
-            if 0 < coordinates[0] <= self.board.width and 0 < coordinates[1] <= self.board.height:
-                return coordinates
-            else:
-                self.cycle += 1
-        #If self.cycle attribute is three, move horizontally west of the board by 1 cell
-        if self.cycle == 3:
-            coordinates = (x-1, y)
-            #Check if new_coordinates are within the boundaries of the board
-            if 0 < coordinates[0] <= self.board.width and 0 < coordinates[1] <= self.board.height:
-                return coordinates
-            #If none of the above moves are executed the reset self_cycle attribute to zero
-            else:
-                self.cycle = 0
+        #If no queued cell is left, go back to hunting for a ship
+        self.implement_strategy = False
+        self.target_hits.clear()
+        return self.draw_hunt_target()
@@ -1,11 +1,100 @@
+import functools
 import random
 
 from battleship.convert import CellConverter
 
+def _cells_mask(start, end, board_width):
+    """ Get the bitmask of all cells from start to end (both included).
+
+    Uses the same bit layout as Ship._cell_bit.
+
+    Args:
+        start (tuple[int, int]): top-left (x, y) cell coordinates
+        end (tuple[int, int]): bottom-right (x, y) cell coordinates
+        board_width (int): width of the board
+
+    Returns:
+        int : integer with the bits of all cells from start to end set
+    """
+    row_stride = board_width + 2
+    row_mask = ((1 << (end[0] - start[0] + 1)) - 1) << start[0]
+    mask = 0
+    for y in range(start[1], end[1] + 1):
+        mask |= row_mask << (y * row_stride)
+    return mask
+
+def _place_ships(board_size, ships_per_length, rng=random):
+    """ Randomly place ships on a board, so that no two ships are near each other.
+
+    Only works with integers and tuples, so that no Ship instance is created
+    for the placements that are rejected.
+
+    Args:
+        board_size (tuple[int,int]): the (width, height) of the board
+        ships_per_length (dict): A dict with the length of ship as keys and
+            the count as values
+        rng (random.Random): random generator to draw the placements from.
+            Defaults to the random module
+
+    Returns:
+        list[tuple] : (start, end) cell coordinates of every ship
+    """
+    #Initialise parameters. The width and height of the board and the list of placements
+    width, height = board_size
+    placements = []
+    #Bitmask of every cell that is occupied by, or near to, a ship that has already been placed
+    forbidden_mask = 0
+    
+    #Iterate through the length of all ships. This must be an integer
+    for length in ships_per_length:
+        #Iterates through the number of ships of given length
+        for number in range(1, ships_per_length[length] + 1):
+            #Keep drawing random placements until one fits on the board and is not near any placed ship
+            while True:
+                #Use the random.randrange (module.function) to randomly initialise start coordinates within the boundaries of the board
+                start_coordinate = (rng.randrange(1, width + 1), rng.randrange(1, height + 1))
+                #create the end_coordinate for the case the ship is horizontal
+                is_horizontal = rng.choice([0, 1])
+                if is_horizontal:
+                    end_coordinate = (start_coordinate[0]+ length - 1, start_coordinate[1])
+                #If the ship is not horizontal then create its end coordinate for the case it's vertical
+                else:
+                    end_coordinate = (start_coordinate[0], start_coordinate[1]+ length - 1)
+                #This statement ensures the created ship is within the bounds of the board
+                if not (width >= end_coordinate[0] > 0 and height >= end_coordinate[1] > 0):
+                    continue
+                #Reject the placement if any of its cells is occupied by or near to a placed ship
+                if _cells_mask(start_coordinate, end_coordinate, width) & forbidden_mask:
+                    continue
+                placements.append((start_coordinate, end_coordinate))
+                #The cells near the ship form the rectangle around it, one cell larger on every side
+                forbidden_mask |= _cells_mask((start_coordinate[0] - 1, start_coordinate[1] - 1),
+                                              (end_coordinate[0] + 1, end_coordinate[1] + 1), width)
+                break
+    return placements
+
+@functools.lru_cache(maxsize=1024)
+def _cached_placements(board_size, counts_key, seed):
+    """ Place ships on a board from a seed, caching the result.
+
+    Args:
+        board_size (tuple[int,int]): the (width, height) of the board
+        counts_key (tuple[tuple[int, int]]): sorted (length, count) pairs
+        seed (int): seed of the random generator
+
+    Returns:
+        tuple[tuple] : (start, end) cell coordinates of every ship
+    """
+    return tuple(_place_ships(board_size, dict(counts_key), random.Random(seed)))
+
 class Ship:
     """ Represent a ship that is placed on the board.
     """
-    def __init__(self, start, end):
+    __slots__ = ('x_start', 'y_start', 'x_end', 'y_end', '_horizontal', '_vertical',
+                 'board_width', 'cells', 'damaged_cells', 'cells_mask', 'damaged_mask',
+                 'halo_mask')
+
+    def __init__(self, start, end, board_width=10):
         """ Creates a ship given its start and end coordinates on the board. 
         
         The order of the cells do not matter.
@@ -15,29 +104,56 @@ class Ship:
                 the starting cell coordinates of the Ship on the board
             end (tuple[int, int]): tuple of 2 positive integers representing
                 the ending cell coordinates of the Ship on the board
+            board_width (int): width of the board the ship is placed on, used
+                to lay out the cell bitmasks. It is widened to fit the ship if
+                needed. Defaults to 10
 
         Raises:
             ValueError: if the ship is neither horizontal nor vertical
         """
         # Start and end (x, y) cell coordinates of the ship
-        self.x_start, self.y_start = start
-        self.x_end, self.y_end = end
+        x_start, y_start = start
+        x_end, y_end = end
 
         # make x_start on left and x_end on right
-        self.x_start, self.x_end = min(self.x_start, self.x_end), max(self.x_start, self.x_end)
+        if x_start > x_end:
+            x_start, x_end = x_end, x_start
         
         # make y_start on top and y_end on bottom
-        self.y_start, self.y_end = min(self.y_start, self.y_end), max(self.y_start, self.y_end)
+        if y_start > y_end:
+            y_start, y_end = y_end, y_start
+
+        self.x_start, self.x_end, self.y_start, self.y_end = x_start, x_end, y_start, y_end
 
-        if not self.is_horizontal() and not self.is_vertical():
+        # Orientation of the ship, computed once as the coordinates never change
+        self._horizontal = self.y_start == self.y_end
+        self._vertical = self.x_start == self.x_end
+
+        if not self._horizontal and not self._vertical:
             raise ValueError("The given coordinates are invalid."
                 "The ship needs to be either horizontal or vertical.")
 
+        # Width used to lay out the bitmasks, widened so that the ship always fits
+        self.board_width = max(board_width, self.x_end)
+
         # Set of all (x,y) cell coordinates that the ship occupies
-        self.cells = self.get_cells()
+        self.cells = frozenset(self.get_cells())
         
         # Set of (x,y) cell coordinates of the ship that have been damaged
+        # Only used for visualising the board; damage is tracked by damaged_mask
         self.damaged_cells = set()
+
+        # Bitmasks of the occupied and damaged cells (one bit per cell, see _cell_bit)
+        self.cells_mask = _cells_mask((self.x_start, self.y_start),
+                                      (self.x_end, self.y_end), self.board_width)
+        self.damaged_mask = 0
+
+        # Bitmask of the cells near the ship: the occupied cells grown by one
+        # cell in all 8 directions. Bits shifted past either side of a row land
+        # in the spare columns, so they never wrap onto another row.
+        row_stride = self.board_width + 2
+        halo_mask = self.cells_mask | (self.cells_mask << 1) | (self.cells_mask >> 1)
+        self.halo_mask = halo_mask | (halo_mask << row_stride) | (halo_mask >> row_stride)
     
     def __len__(self):
         return self.length()
@@ -45,17 +161,29 @@ class Ship:
     def __repr__(self):
         return f"Ship(start=({self.x_start},{self.y_start}), end=({self.x_end},{self.y_end}))"
         
+    def _cell_bit(self, cell):
+        """ Get the bitmask of a single (x, y) cell coordinate.
+
+        Cells are laid out row by row with a spare column on each side of the
+        board (bit = y * (board_width + 2) + x), so that cells just off the
+        left or right edge never share a bit with cells of another row.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+
+        Returns:
+            int : integer with only the bit of the given cell set
+        """
+        return 1 << (cell[1] * (self.board_width + 2) + cell[0])
+
     def is_vertical(self):
         """ Check whether the ship is vertical.
         
         Returns:
             bool : True if the ship is vertical. False otherwise.
         """
-        #If the starting and ending horizontal coordinates of the ship are equal then it is vertically aligned
-        if self.x_start == self.x_end:
-            return True
-        #If not, then return False, as it is not vertically aligned
-        return False
+        #The ship is vertically aligned if its starting and ending horizontal coordinates are equal (see __init__)
+        return self._vertical
    
     def is_horizontal(self):
         """ Check whether the ship is horizontal.
@@ -63,11 +191,8 @@ class Ship:
         Returns:
             bool : True if the ship is horizontal. False otherwise.
         """
-        #If the starting and ending vertical coordinates of the ship are equal then it is horizontally aligned
-        if self.y_start == self.y_end:
-            return True
-        #If not, then return False as it is not horizontally aligned
-        return False
+        #The ship is horizontally aligned if its starting and ending vertical coordinates are equal (see __init__)
+        return self._horizontal
     
     def get_cells(self):
         """ Get the set of all cell coordinates that the ship occupies.
@@ -81,7 +206,7 @@ class Ship:
             set[tuple] : Set of (x ,y) coordinates of all cells a ship occupies
         """
         #First check if ship is horizontally aligned
-        if self.is_horizontal():
+        if self._horizontal:
             #Create an empty cells_set of type(set)
             cells_set = set()
             #For each x_coordinate occupied by the ship, create a tuple of its x and y coordinates and add it to the cells_set
@@ -91,7 +216,7 @@ class Ship:
             return cells_set
 
         #Check if the ship is vertically aligned
-        elif self.is_vertical():
+        elif self._vertical:
             #Create an empty cells_set of type(set)
             cells_set = set()
              #For each y_coordinate occupied by the ship, create a tuple of its x and y coordinates and add it to the cells_set
@@ -106,14 +231,8 @@ class Ship:
         Returns:
             int : The number of cells the ship occupies
         """
-        #For a horizontally aligned ship return the integer length of the cells (type(set)) it occupies
-        if self.is_horizontal():
-            return int(len(self.cells))
-        #For a vertically aligned ship return the integer length of the cells (type(set)) it occupies
-        elif self.is_vertical():
-            return(int(len(self.cells)))
-        #In the case the ship is not vertical nor horizontal return zero
-        return 0
+        #A ship is always horizontal or vertical (see __init__), so its length is the number of cells it occupies
+        return len(self.cells)
 
     def is_occupying_cell(self, cell):
         """ Check whether the ship is occupying a given cell
@@ -126,28 +245,10 @@ class Ship:
             bool : return True if the given cell is one of the cells occupied 
                 by the ship. Otherwise, return False
         """
-        #check = cell in  self.cells
-        #return check
-        #Define the integer variables of the coordinates of the cell to check against
         check_x, check_y = cell
-        #First check if the ship is horizontal and if so, if its y-coordinate is equal to that of the cell we are checking against (check_y)
-        if self.is_horizontal() and self.y_start == check_y:
-            #Iterate through all x-coordinates occupied by the ship and check if any of them are equal to that of the cell we are checking against (check_x)
-            for x_coordinate in range(self.x_start, self.x_end + 1):
-                if check_x == x_coordinate:
-                    #Return True when the first x_coordinate equals that of the cell we are checking against
-                    return True
-            #Return False if none of the coordinates occupied by the ship is equal to that of the cell we are checking against
-            return False
-        #First check if the ship is vertical and if so, if its x-coordinate is equal to that of the cell we are checking against (check_x)
-        elif self.is_vertical() and self.x_start == check_x:
-            #Iterate through all y-coordinates occupied by the ship and check if any of them are equal to that of the cell we are checking against (check_y)
-            for y_coordinate in range(self.y_start, self.y_end + 1):
-                if check_y == y_coordinate:
-                    #Return True when the first y_coordinate equals that of the cell we are checking against
-                    return True
-            #Return False if none of the coordinates occupied by the ship is equal to that of the cell we are checking against
-            return False
+        #The ship is a contiguous line of cells, and one of the two ranges is a single row or column
+        return (self.x_start <= check_x <= self.x_end and
+                self.y_start <= check_y <= self.y_end)
     
     def receive_damage(self, cell):
         """ Receive attack at given cell. 
@@ -167,8 +268,9 @@ class Ship:
         """
         #Use the is_occupying_cell method to check if the cell we are checking agaist is occupied by the ship
         if self.is_occupying_cell(cell):
-            #If this is True then, add the cell to the damaged_cells set
+            #If this is True then, add the cell to the damaged_cells set and mark its bit as damaged
             self.damaged_cells.add(cell)
+            self.damaged_mask |= self._cell_bit(cell)
             return True
         #If the ship does not occupy the cell we are checking against, do not update the damaged_cells set and return False
         else:
@@ -191,14 +293,8 @@ class Ship:
             bool : return True if the ship is damaged at all its positions. 
                 Otherwise, return False
         """
-        #Use the .difference() method for sets to subtract the tuples present in the damaged_cells set from those present in the cells set of the ship
-        #NOTE: len(self.cells) == len(self.damaged_cells) might be a better alternative 
-        if len(self.cells.difference(self.damaged_cells)) == 0:
-            #If the difference is zero, return True and the ship has sunk
-            return True
-        #If the difference between the two sets is non-zero then the ship is still floating, and return False
-        else:
-            return False
+        #The ship has sunk once every occupied bit is also a damaged bit
+        return self.damaged_mask == self.cells_mask
     
     def is_near_ship(self, other_ship):
         """ Check whether a ship is near another ship instance.
@@ -214,14 +310,12 @@ class Ship:
         """  
         assert isinstance(other_ship, Ship)
         
-        #Iterate through all the cells occupied by the other_ship instance
-        for cell in other_ship.cells:
-            #Check if any of the cells of the other_ship are close to those of the current ship
-            if self.is_near_cell(cell):
-                #When this is True, return True meaning the current ship is near the other_ship
-                return True 
-        #If none of the cells occupied by the other ship are near to those of the current ship, return False      
-        return False
+        #The ships are near each other if any cell of other_ship lies within the halo of this ship
+        if self.board_width == other_ship.board_width:
+            return bool(self.halo_mask & other_ship.cells_mask)
+        #Bitmasks laid out for different widths cannot be compared, so compare the coordinates instead
+        return (self.x_start - 1 <= other_ship.x_end and other_ship.x_start <= self.x_end + 1
+                and self.y_start - 1 <= other_ship.y_end and other_ship.y_start <= self.y_end + 1)
 
     def is_near_cell(self, cell):
         """ Check whether the ship is near an (x,y) cell coordinate.
@@ -249,29 +343,10 @@ class Ship:
             bool : returns True if and only if the (x, y) coordinate is at most
                 one cell from any part of the ship OR is at the corner of the ship. Returns False otherwise.
         """
-        #First check if the ship is horizontal
-        if self.is_horizontal():
-            #Iterate through all tuples of coordinates that the ship occupies
-           for coordinates in self.cells:
-               #Check if the current coordinates are close to the cell being checked against or overlapping it. If so, return True
-               if ((coordinates[0] - 1 <= cell[0] <= coordinates[0] + 1) and (coordinates[1] - 1  <= cell[1] <= coordinates[1] + 1)):
-                   return True
-               else:
-                   pass
-            #Return False for the case, a horizontal ship's coordinates are not close or do not overlap those of the cell being checked against
-           return False
-        #First check if the ship is vertical  
-        if self.is_vertical():
-            #Iterate through all tuples of coordinates that the ship occupies
-            for coordinates in self.cells:
-                #Check if the current coordinates are close to the cell being checked against or overlapping it. If so, return True
-               if ((coordinates[0] - 1 <= cell[0] <= coordinates[0] + 1) and (coordinates[1] - 1  <= cell[1] <= coordinates[1] + 1)): 
-                   return True
-               else:
-                    pass
-            #Return False for the case, a horizontal ships coordinates are not close or do not overlap that of the cell being checked against
-            return False
-            #NOTE: This is the initial code returned: return(self.x_start-1 <= cell[0] <= self.x_end+1 and self.y_start -1 <= cell[1] <= self.y_end +1)
+        check_x, check_y = cell
+        #The cells near the ship form the rectangle around it, one cell larger on every side, whatever its orientation
+        return (self.x_start - 1 <= check_x <= self.x_end + 1 and
+                self.y_start - 1 <= check_y <= self.y_end + 1)
 
 class ShipFactory:
     """ Class to create new ships in specific configurations."""
@@ -309,9 +384,10 @@ class ShipFactory:
         """
         converter = CellConverter(board_size)
         return Ship(start=converter.from_str(start),
-                    end=converter.from_str(end))
+                    end=converter.from_str(end),
+                    board_width=board_size[0])
 
-    def generate_ships(self):
+    def generate_ships(self, seed=None):
         """ Generate a list of ships in the appropriate configuration.
         
         The number and length of ships generated must obey the specifications 
@@ -321,56 +397,25 @@ class ShipFactory:
         
         The coordinates should also be valid given self.board_size
         
+        Args:
+            seed (int): if given, the ships are placed using a random generator
+                seeded with it, so the same seed always gives the same ships.
+                Placements are cached per board size, ships and seed.
+                Defaults to None (placed using the random module)
+        
         Returns:
             list[Ships] : A list of Ship instances, adhering to the rules above
         """
-        #import random
-        from random import randrange
-
-        #Initialise parameters. The width and height of the board and the ships list
-        width, height = self.board_size
+        width = self.board_size[0]
+        if seed is None:
+            placements = _place_ships(self.board_size, self.ships_per_length)
+        else:
+            counts_key = tuple(sorted(self.ships_per_length.items()))
+            placements = _cached_placements(tuple(self.board_size), counts_key, seed)
+        #Only create the Ship instances once all placements have been accepted
         ships = []
-        
-        #Iterate through the length of all ships. This must be an integer
-        for length in self.ships_per_length:
-            #Iterates through the number of ships of given length
-            for number in range(1, self.ships_per_length[length] + 1):               
-                #This first dummy variable will help in initiating the start and end coordinates of each ship instance to be created
-                dummy_variable = True
-                #Enter a while loop until the randomly generated start and end coordinates ensure that the ship is either horizontal or vertical
-                while dummy_variable:
-                    #Use the random.randrange (module.function) to randomly initialise start coordinates within the boundaries of the board
-                    start_coordinate = (random.randrange(1, width + 1), random.randrange(1, height + 1))
-                    #create the end_coordinate for the case the ship is horizontal
-                    is_horizontal = random.choice([0, 1])
-                    if is_horizontal:
-                        end_coordinate = (start_coordinate[0]+ length - 1, start_coordinate[1])
-                    #If the ship is not horizontal then create its end coordinate for the case it's vertical
-                    else:
-                        end_coordinate = (start_coordinate[0], start_coordinate[1]+ length - 1)
-                    #This statement ensures the created ship is within the bounds of the board
-                    if not (width >= end_coordinate[0] > 0 and height >= end_coordinate[1] > 0):
-                        continue
-                    #Create the ship instance after having worked through the above conditional statements
-                    new_ship = Ship(start_coordinate, end_coordinate)
-                    #For the list of ships, in the case the list is not empty, set the dummy_variable to False
-                    if len(ships) != 0:
-                        dummy_variable = False
-                        #Iterate through all other ships in the list
-                        for ship in ships:
-                            #When one ship is found to be near the newly created ship, dummy variable is set to True and the for loop is broken
-                            #This then carries on while loop until a new_ship which is not close to any ships in the ships list is created above
-                            dummy_variable = ship.is_near_ship(new_ship)
-                            if dummy_variable:
-                                break
-                        #When dummy variable is false for all ships in the list, the new ship is appended, as it is not near to any of them. As a result, the while loop is exited
-                        if not dummy_variable:
-                            ships.append(new_ship)
-                            dummy_variable = False
-                    #This conditional statement is for the first ship instance that is created
-                    else:
-                        ships.append(new_ship)
-                        dummy_variable = False
+        for start_coordinate, end_coordinate in placements:
+            ships.append(Ship(start_coordinate, end_coordinate, board_width=width))
         return ships
         
 if __name__ == '__main__':
@@ -1,3 +1,7 @@
+import random
+from multiprocessing import Pool
+
+import battleship.player
 from battleship.board import Board
 from battleship.game import Game
 from battleship.player import AutomaticPlayer, ManualPlayer, RandomPlayer
@@ -109,3 +113,62 @@ class AutomaticVsAutomaticSimulation:
         # Creating and launching the game
         game = Game(player1=alice, player2=bob)
         game.play()
+
+
+
+def play_one_game(seed):
+    """ Play a silent game of an AutomaticPlayer against a RandomPlayer.
+    
+    The random generators (of the random module and of the players) are
+    seeded first, so that the same seed always gives the same game, whichever
+    process the game is played in.
+    
+    Args:
+        seed (int): seed of the random generator
+    
+    Returns:
+        tuple : (has_automatic_won, number_of_attacks) where
+            - has_automatic_won is True if and only if the AutomaticPlayer won
+            - number_of_attacks is the number of attacks made by the winner
+    """
+    random.seed(seed)
+    battleship.player.seed(seed)
+    automatic = AutomaticPlayer(name="Automatic")
+    opponent = RandomPlayer(name="Random")
+    
+    # Same rules as Game.play(), without printing anything
+    if random.choice([True, False]):
+        attacker, defender = automatic, opponent
+    else:
+        attacker, defender = opponent, automatic
+    number_of_attacks = {automatic: 0, opponent: 0}
+    
+    while not defender.has_lost():
+        target_cell = attacker.select_target()
+        number_of_attacks[attacker] += 1
+        is_ship_hit, has_ship_sunk = defender.board.is_attacked_at(target_cell)
+        attacker.receive_result(is_ship_hit, has_ship_sunk)
+        
+        # If an opponent's ship is hit, the player is allowed to play another time.
+        if not is_ship_hit:
+            attacker, defender = defender, attacker
+    
+    # The game stops right after the attacker sinks the last ship of the defender
+    return attacker is automatic, number_of_attacks[attacker]
+
+
+class ParallelAutomaticVsRandomSimulation:
+    """ Many silent games of your AI player against a RandomPlayer, played in parallel. """
+    def __init__(self, number_of_games=1000):
+        self.number_of_games = number_of_games
+        
+    def run(self):
+        # Games are independent, so they are spread over all the CPU cores
+        with Pool() as pool:
+            results = pool.map(play_one_game, range(self.number_of_games))
+        
+        wins = [number_of_attacks for has_automatic_won, number_of_attacks in results
+                if has_automatic_won]
+        print(f"AutomaticPlayer won {len(wins)} out of {self.number_of_games} games.")
+        if wins:
+            print(f"It needed {sum(wins) / len(wins):.1f} attacks on average to win.")
@@ -10,6 +10,7 @@ if __name__ == '__main__':
         sim.ManualVsAutomaticSimulation(),
         sim.RandomVsAutomaticSimulation(),
         sim.AutomaticVsAutomaticSimulation(),
+        sim.ParallelAutomaticVsRandomSimulation(),
     ]
     
     index = 0
@@ -18,5 +18,20 @@ def test_board():
     assert has_ship_sunk == False
 
 
+def test_all_ships_sunk():
+    ships = [
+        Ship(start=(11, 1), end=(12, 1)),  # length = 2
+        Ship(start=(1, 3), end=(1, 3)),  # length = 1
+    ]
+    board = Board(ships=ships, size=(12, 12), ships_per_length={1: 1, 2: 1})
+    assert board.is_attacked_at((2, 3)) == (False, False)
+    assert board.is_attacked_at((11, 1)) == (True, False)
+    assert board.is_attacked_at((12, 1)) == (True, True)
+    assert board.have_all_ships_sunk() == False
+    assert board.is_attacked_at((1, 3)) == (True, True)
+    assert board.have_all_ships_sunk() == True
+
+
 if __name__ == "__main__":
-    test_board()
\ No newline at end of file
+    test_board()
+    test_all_ships_sunk()
\ No newline at end of file
@@ -1,10 +1,110 @@
-from battleship.player import RandomPlayer
+import itertools
+import multiprocessing
+
+from battleship.board import Board
+from battleship.player import AutomaticPlayer, ManualPlayer, RandomPlayer, _randrange
 
 def test_player():
     player = RandomPlayer("Alice")
     print(player.select_target())
     print(player.select_target())
     print(player.select_target())
+
+
+def test_players_attack_whole_board():
+    for player in (RandomPlayer("Alice"), AutomaticPlayer("Bob")):
+        targets = set()
+        for _ in range(100):
+            targets.add(player.select_target())
+            player.receive_result(False, False)
+        assert len(targets) == 100
+        if isinstance(player, RandomPlayer):
+            assert player.tracker == targets
+
+
+def test_automatic_player_falls_back_to_random_targets():
+    player = AutomaticPlayer("Bob")
+    # No placement is left for a ship longer than the board
+    player.placements[11] = []
+    player.remaining_ship_lengths = [11]
+    targets = set()
+    for _ in range(100):
+        targets.add(player.select_target())
+        player.receive_result(False, False)
+    assert len(targets) == 100
+
+
+def test_automatic_player_follows_ship_axis():
+    player = AutomaticPlayer("Bob")
+    player.previous_coordinates = (5, 5)
+    player.attacked_positions.add((5, 5))
+    player.receive_result(True, False)
+    assert set(player.target_queue) == {(5, 6), (6, 5), (5, 4), (4, 5)}
+    assert player.select_target() == (5, 6)
+    player.receive_result(True, False)
+    assert list(player.target_queue) == [(5, 7), (5, 4)]
+
+
+def test_player_names_from_counter():
+    counter = itertools.count(1)
+    assert RandomPlayer(name="Alice", counter=counter).name == "Alice"
+    assert RandomPlayer(counter=counter).name == "Player 1"
+    assert AutomaticPlayer(counter=counter).name == "Player 2"
+
+
+def test_manual_player_cell_from_str():
+    player = ManualPlayer(Board(), name="Alice")
+    assert player.cell_from_str("J9") == (10, 9)
+    assert player.cell_from_str(" A1 ") == (1, 1)
+    assert player.cell_from_str("A01") == (1, 1)
+    assert player.cell_from_str("A 1") == (1, 1)
+    for coord_str in ("K1", "A11", "A0", "", "1A", "a1"):
+        try:
+            player.cell_from_str(coord_str)
+        except ValueError:
+            continue
+        assert False
+
+
+def test_automatic_player_hunts_on_density():
+    player = AutomaticPlayer("Bob")
+    player.remaining_ship_lengths = [5]
+    # A ship of length 5 is the most likely to cover the middle of the board
+    assert player.select_target() in {(5, 5), (6, 5), (5, 6), (6, 6)}
+    player.receive_result(False, False)
+    # No ship can be next to a sunk ship
+    player.previous_coordinates = (1, 1)
+    player.attacked_positions.add((1, 1))
+    player.receive_result(True, True)
+    player.remaining_ship_lengths = [1]
+    for _ in range(60):
+        target = player.select_target()
+        assert target not in {(1, 2), (2, 1), (2, 2)}
+        player.receive_result(False, False)
+
+
+def _draw_targets(queue):
+    queue.put([_randrange(10**9) for _ in range(5)])
+
+
+def test_forked_workers_draw_different_targets():
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=_draw_targets, args=(queue,)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    draws = [queue.get(timeout=10) for _ in workers]
+    for worker in workers:
+        worker.join()
+    assert draws[0] != draws[1]
+
     
 if __name__ == "__main__":
-    test_player()
\ No newline at end of file
+    test_player()
+    test_players_attack_whole_board()
+    test_automatic_player_falls_back_to_random_targets()
+    test_automatic_player_follows_ship_axis()
+    test_player_names_from_counter()
+    test_manual_player_cell_from_str()
+    test_automatic_player_hunts_on_density()
+    test_forked_workers_draw_different_targets()
\ No newline at end of file
@@ -9,5 +9,52 @@ def test_horizontal():
     assert output == True
 
 
+def test_has_sunk():
+    ship = Ship(start=(3, 3), end=(5, 3))
+    ship.receive_damage((3, 3))
+    ship.receive_damage((4, 3))
+    assert ship.has_sunk() == False
+    ship.receive_damage((5, 3))
+    assert ship.has_sunk() == True
+
+
+def test_ship_wider_than_default_board():
+    ship = Ship(start=(11, 1), end=(12, 1))
+    assert ship.is_occupying_cell((12, 1)) == True
+    assert ship.is_occupying_cell((1, 2)) == False
+    ship.receive_damage((11, 1))
+    ship.receive_damage((12, 1))
+    assert ship.has_sunk() == True
+
+
+def test_is_near_cell_at_board_edges():
+    ships = [
+        Ship(start=(1, 1), end=(1, 5)),
+        Ship(start=(6, 10), end=(10, 10)),
+        Ship(start=(10, 1), end=(10, 1)),
+    ]
+    for ship in ships:
+        for x in range(-1, 13):
+            for y in range(-1, 13):
+                expected = (ship.x_start - 1 <= x <= ship.x_end + 1 and
+                            ship.y_start - 1 <= y <= ship.y_end + 1)
+                assert ship.is_near_cell((x, y)) == expected
+
+
+def test_is_near_ship():
+    ship = Ship(start=(3, 3), end=(5, 3))
+    assert ship.is_near_ship(Ship(start=(6, 4), end=(6, 6))) == True
+    assert ship.is_near_ship(Ship(start=(7, 3), end=(9, 3))) == False
+    # Ships laid out for different board widths are still compared correctly
+    assert ship.is_near_ship(Ship(start=(6, 4), end=(6, 6), board_width=12)) == True
+    assert ship.is_near_ship(Ship(start=(7, 3), end=(9, 3), board_width=12)) == False
+    # A ship on the right edge is not near a ship on the left of the next row
+    assert Ship(start=(10, 1), end=(10, 1)).is_near_ship(Ship(start=(1, 2), end=(1, 2))) == False
+
+
 if __name__ == "__main__":
-    test_horizontal()
\ No newline at end of file
+    test_horizontal()
+    test_has_sunk()
+    test_ship_wider_than_default_board()
+    test_is_near_cell_at_board_edges()
+    test_is_near_ship()
\ No newline at end of file
@@ -9,5 +9,31 @@ def test_generate_ships():
     board = Board(ships=ships)
     board.validate_ships() # No ValueError is good news!
 
+def test_generated_ships_never_touch():
+    ship_factory = ShipFactory()
+    for _ in range(200):
+        ships = ship_factory.generate_ships()
+        for ship in ships:
+            for other_ship in ships:
+                if ship is other_ship:
+                    continue
+                for x, y in other_ship.cells:
+                    assert not (ship.x_start - 1 <= x <= ship.x_end + 1 and
+                                ship.y_start - 1 <= y <= ship.y_end + 1)
+
+
+def test_generate_ships_from_seed():
+    ship_factory = ShipFactory()
+    ships = ship_factory.generate_ships(seed=7)
+    same_ships = ship_factory.generate_ships(seed=7)
+    assert [ship.cells for ship in ships] == [ship.cells for ship in same_ships]
+    # Ships built from a cached layout are independent of each other
+    ships[0].receive_damage(next(iter(ships[0].cells)))
+    assert same_ships[0].count_damaged_cells() == 0
+    Board(ships=same_ships).validate_ships()
+
+
 if __name__ == "__main__":
-    test_generate_ships()
\ No newline at end of file
+    test_generate_ships()
+    test_generated_ships_never_touch()
+    test_generate_ships_from_seed()
\ No newline at end of file